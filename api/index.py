@@ -1,10 +1,74 @@
-from flask import Flask, request, jsonify
+import gzip
+import hashlib
+import orjson
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import JSONProvider
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson's C encoder/decoder."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+VALID_AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+# Deletes every valid residue, so whatever survives translate() is invalid
+_STRIP_VALID = str.maketrans('', '', VALID_AMINO_ACIDS)
+
+def _normalize_sequence(raw_sequence):
+    """Type-check, strip and upper-case a submitted sequence, raising ValueError if it is unusable."""
+    if not isinstance(raw_sequence, str):
+        raise ValueError('Expected a string')
+    sequence = raw_sequence.strip().upper()
+    if not sequence:
+        raise ValueError('No sequence provided')
+    invalid_chars = sequence.translate(_STRIP_VALID)
+    if invalid_chars:
+        raise ValueError(f"Invalid characters detected: {', '.join(sorted(set(invalid_chars)))}")
+    return sequence
+
+# The home payload is static, so encode and hash it once at import
+_HOME_BODY = orjson.dumps({"message": "Protein Analysis API is running"})
+_HOME_ETAG = hashlib.sha1(_HOME_BODY).hexdigest()
+
+# Bodies below this size gain nothing from gzip once its header is added
+_GZIP_MIN_SIZE = 1024
+
+@app.after_request
+def compress_response(response):
+    """Gzip large successful responses for clients that accept it."""
+    if (not 200 <= response.status_code < 300
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or request.accept_encodings['gzip'] <= 0):
+        return response
+    
+    body = response.get_data()
+    if len(body) < _GZIP_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
 
 @app.route('/', methods=['GET'])
 def home():
-    return jsonify({"message": "Protein Analysis API is running"})
+    response = Response(_HOME_BODY, mimetype='application/json')
+    response.set_etag(_HOME_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response.make_conditional(request)
 
 @app.route('/api/test', methods=['GET'])
 def test():
@@ -13,11 +77,20 @@ def test():
 @app.route('/api/analyze', methods=['POST'])
 def analyze():
     try:
-        data = request.get_json()
-        if not data or 'sequence' not in data:
-            return jsonify({'error': 'No sequence provided'}), 400
+        if request.mimetype == 'text/plain':
+            # Raw sequence body: skip JSON parsing entirely
+            raw_sequence = request.get_data(as_text=True)
+        else:
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict) or 'sequence' not in data:
+                return jsonify({'error': 'No sequence provided'}), 400
+            raw_sequence = data['sequence']
+        
+        try:
+            sequence = _normalize_sequence(raw_sequence)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        sequence = data['sequence'].upper()
         return jsonify({
             'sequence': sequence,
             'length': len(sequence)
@@ -25,3 +98,27 @@ def analyze():
     except Exception as e:
         print(f"Error: {str(e)}")
         return jsonify({'error': str(e)}), 500
+
+@app.route('/api/analyze_batch', methods=['POST'])
+def analyze_batch():
+    try:
+        # silent=True turns unparsable or non-JSON bodies into None rather than an HTTPException
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get('sequences'), list):
+            return jsonify({'error': 'No sequences provided'}), 400
+        
+        results = []
+        for index, raw_sequence in enumerate(data['sequences']):
+            try:
+                sequence = _normalize_sequence(raw_sequence)
+            except ValueError as e:
+                return jsonify({'error': f"Sequence {index}: {e}"}), 400
+            
+            results.append({
+                'sequence': sequence,
+                'length': len(sequence)
+            })
+        return jsonify(results)
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
@@ -1,5 +1,9 @@
+import os
 from index import app
 
+# Name WSGI servers look for, e.g. `gunicorn --chdir api -w $(nproc) --threads 2 wsgi:application`
+application = app
+
 # This is for local development
 if __name__ == '__main__':
-    app.run()
+    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)), threaded=True)
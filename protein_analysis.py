@@ -1,7 +1,9 @@
 import requests
 import json
+import hashlib
 from typing import Dict, List, Tuple, Optional
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
 import pandas as pd
@@ -10,6 +12,16 @@ import biotite.structure as struc
 from Bio import SeqIO
 import aiohttp
 import asyncio
+import contextlib
+import copy
+import ahocorasick
+
+def _bitmask(residues: str) -> int:
+    """Pack a residue set into an int with bit ord(aa) set for each member."""
+    mask = 0
+    for aa in residues:
+        mask |= 1 << ord(aa)
+    return mask
 
 class ProteinAnalyzer:
     """Advanced protein analysis using real bioinformatics tools and APIs."""
@@ -20,17 +32,21 @@ class ProteinAnalyzer:
         self.psipred_url = "http://bioinf.cs.ucl.ac.uk/psipred/api/submission"
         self.pfam_url = "https://pfam.xfam.org/search/sequence"
         
-        # Cache for results
+        # Cache for remote API results, keyed by (service, sha1 of sequence)
         self.cache = {}
+        self.cache_size = 4096
+        
+        # Shared HTTP session for the remote APIs, open only inside `async with analyzer`
+        self._session = None
         
         # Amino acid properties
-        self.hydrophobic = set("VILMFYW")
-        self.polar = set("STNQ")
-        self.charged = set("DEKR")
+        self.hydrophobic = frozenset("VILMFYW")
+        self.polar = frozenset("STNQ")
+        self.charged = frozenset("DEKR")
         self.structure_prone = {
-            'helix': set("MALEKR"),
-            'sheet': set("VIVFY"),
-            'coil': set("GPNS")
+            'helix': frozenset("MALEKR"),
+            'sheet': frozenset("VIFWY"),
+            'coil': frozenset("GPNS")
         }
         
         # Known protein domains
@@ -50,27 +66,124 @@ class ProteinAnalyzer:
             }
         }
         
+        # Aho-Corasick automaton matching every known domain pattern in one pass
+        self._domain_automaton = ahocorasick.Automaton()
+        for domain_type, info in self.known_domains.items():
+            self._domain_automaton.add_word(info["pattern"], domain_type)
+        self._domain_automaton.make_automaton()
+        
         # Secondary structure propensities (using consistent naming)
-        self.helix_prone = set("MALEKR")
-        self.sheet_prone = set("VIVFY")
-        self.coil_prone = set("GPNS")
+        self.helix_prone = frozenset("MALEKR")
+        self.sheet_prone = frozenset("VIFWY")
+        self.coil_prone = frozenset("GPNS")
+        
+        # Bitmask forms of every property: `(bits >> ord(aa)) & 1` tests membership
+        self.hydrophobic_bits = _bitmask(self.hydrophobic)
+        self.polar_bits = _bitmask(self.polar)
+        self.charged_bits = _bitmask(self.charged)
+        self.helix_bits = _bitmask(self.helix_prone)
+        self.sheet_bits = _bitmask(self.sheet_prone)
+        self.coil_bits = _bitmask(self.coil_prone)
+        
+        # Property membership masks indexed by ASCII code, generated from the
+        # bitmasks, one column per property: hydrophobic, polar, charged, helix, sheet, coil
+        property_bits = (self.hydrophobic_bits, self.polar_bits, self.charged_bits,
+                         self.helix_bits, self.sheet_bits, self.coil_bits)
+        self._property_masks = np.array(
+            [[(bits >> code) & 1 for bits in property_bits] for code in range(256)],
+            dtype=np.int64
+        )
+        # Rows for 'A'..'Z' only; no other byte belongs to any property
+        self._letter_masks = self._property_masks[ord('A'):ord('Z') + 1]
+        
+    def _property_counts(self, sequence: str) -> np.ndarray:
+        """
+        Count residues in each property class (in _property_masks column order).
+        The sequence is scanned once into per-letter counts; every property is
+        then a dot product of the 26 letter counts with its mask.
+        Non-ASCII characters encode as '?', which belongs to no property.
+        """
+        counts = np.bincount(np.frombuffer(sequence.encode('ascii', 'replace'), dtype=np.uint8), minlength=256)
+        return counts[ord('A'):ord('Z') + 1] @ self._letter_masks
         
+    def analyze_protein_array(self, sequence: str) -> np.ndarray:
+        """
+        Summarize composition as a fixed-shape float64 vector:
+        [length, hydrophobic fraction, polar fraction, charged fraction].
+        Vectors for many sequences stack into an (N, 4) matrix with np.stack.
+        """
+        total_len = len(sequence)
+        counts = self._property_counts(sequence)[:3].tolist()
+        return np.array([total_len] + [count / total_len for count in counts], dtype=np.float64)
+        
+    def _new_session(self) -> aiohttp.ClientSession:
+        """Create an HTTP session for the remote APIs."""
+        return aiohttp.ClientSession(
+            headers={'Content-Type': 'application/json'},
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+        )
+
+    async def __aenter__(self) -> "ProteinAnalyzer":
+        """Open one HTTP session shared (and kept alive) by every call in the block."""
+        if self._session is None or self._session.closed:
+            self._session = self._new_session()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @contextlib.asynccontextmanager
+    async def _client_session(self):
+        """Yield the shared session inside `async with analyzer`, otherwise a per-call one."""
+        if self._session is not None and not self._session.closed:
+            yield self._session
+        else:
+            async with self._new_session() as session:
+                yield session
+
+    def _cache_key(self, service: str, sequence: str) -> Tuple[str, str]:
+        """Key remote results by service and sequence hash."""
+        return service, hashlib.sha1(sequence.encode('utf-8')).hexdigest()
+
+    def _cached(self, key: Tuple[str, str]) -> Optional[Dict]:
+        """Return a copy of a cached result, marking it most recently used, or None on a miss."""
+        if key not in self.cache:
+            return None
+        self.cache[key] = self.cache.pop(key)
+        return copy.deepcopy(self.cache[key])
+
+    def _cache_result(self, key: Tuple[str, str], result: Dict) -> Dict:
+        """Store a remote result, evicting the least recently used entry once the cache is full."""
+        if len(self.cache) >= self.cache_size:
+            self.cache.pop(next(iter(self.cache)))
+        self.cache[key] = result
+        # Callers get their own copy so mutating it cannot corrupt the cache
+        return copy.deepcopy(result)
+
     async def predict_protein_function(self, sequence: str) -> Dict:
         """
         Predict protein function using InterProScan API.
         Returns detailed functional annotations.
         """
-        headers = {'Content-Type': 'application/json'}
+        cache_key = self._cache_key('interpro', sequence)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+        
         data = {'sequence': sequence}
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(f"{self.interpro_url}/predict", 
-                                     json=data, 
-                                     headers=headers) as response:
+            async with self._client_session() as session:
+                async with session.post(f"{self.interpro_url}/predict", json=data) as response:
                     if response.status == 200:
                         result = await response.json()
-                        return self._process_interpro_results(result)
+                        return self._cache_result(cache_key, self._process_interpro_results(result))
                     else:
                         # Fallback prediction
                         return await self._predict_protein_function_fallback(sequence)
@@ -84,10 +197,7 @@ class ProteinAnalyzer:
         """
         try:
             # Analyze amino acid composition
-            total_len = len(sequence)
-            hydrophobic_content = sum(aa in self.hydrophobic for aa in sequence) / total_len
-            polar_content = sum(aa in self.polar for aa in sequence) / total_len
-            charged_content = sum(aa in self.charged for aa in sequence) / total_len
+            _, hydrophobic_content, polar_content, charged_content = self.analyze_protein_array(sequence).tolist()
             
             # Make predictions based on amino acid properties
             predictions = {
@@ -156,11 +266,18 @@ class ProteinAnalyzer:
         """Predict protein domains based on sequence patterns and properties."""
         domains = []
         
+        # Find the first occurrence of each known domain in a single scan
+        first_match_end = {}
+        for end_index, domain_type in self._domain_automaton.iter(sequence):
+            first_match_end.setdefault(domain_type, end_index)
+            if len(first_match_end) == len(self.known_domains):
+                break
+        
         # Check for known domains
         for domain_type, info in self.known_domains.items():
-            if info["pattern"] in sequence:
-                start = sequence.find(info["pattern"])
-                end = start + len(info["pattern"])
+            if domain_type in first_match_end:
+                end = first_match_end[domain_type] + 1
+                start = end - len(info["pattern"])
                 domains.append({
                     "name": info.get("name", domain_type),
                     "start": start + 1,  # 1-based indexing for biology
@@ -180,35 +297,29 @@ class ProteinAnalyzer:
                 "mixed": {"score": 0, "start": 0, "end": 0}
             }
             
-            # Analyze sequence in windows
-            for i in range(len(sequence) - window_size + 1):
-                window = sequence[i:i + window_size]
+            # Score every window at once: per-window residue counts come from
+            # prefix sums of the membership masks (a rolling count, O(1) per window);
+            # non-ASCII characters encode as '?', which belongs to no property
+            codes = np.frombuffer(sequence.encode('ascii', 'replace'), dtype=np.uint8)
+            if len(codes) >= window_size:
+                prefix = np.zeros((len(codes) + 1, self._property_masks.shape[1]), dtype=np.int64)
+                np.cumsum(self._property_masks[codes], axis=0, out=prefix[1:])
+                window_counts = prefix[window_size:] - prefix[:-window_size]
+                hydrophobic = window_counts[:, 0] / window_size
+                charged = window_counts[:, 2] / window_size
                 
-                # Calculate properties
-                hydrophobic = sum(aa in self.hydrophobic for aa in window) / window_size
-                charged = sum(aa in self.charged for aa in window) / window_size
-                polar = sum(aa in self.polar for aa in window) / window_size
-                
-                # Update best domains if this window has higher scores
-                if hydrophobic > 0.5 and hydrophobic * 100 > best_domains["hydrophobic"]["score"]:
-                    best_domains["hydrophobic"] = {
-                        "score": hydrophobic * 100,
-                        "start": i + 1,
-                        "end": i + window_size
-                    }
-                
-                if charged > 0.4 and charged * 100 > best_domains["charged"]["score"]:
-                    best_domains["charged"] = {
-                        "score": charged * 100,
-                        "start": i + 1,
-                        "end": i + window_size
-                    }
-                
-                if abs(hydrophobic - charged) < 0.2 and max(hydrophobic, charged) > 0.3:
-                    score = max(hydrophobic, charged) * 100
-                    if score > best_domains["mixed"]["score"]:
-                        best_domains["mixed"] = {
-                            "score": score,
+                # Keep the first highest-scoring window of each type
+                candidates = {
+                    "hydrophobic": (hydrophobic * 100, hydrophobic > 0.5),
+                    "charged": (charged * 100, charged > 0.4),
+                    "mixed": (np.maximum(hydrophobic, charged) * 100,
+                              (np.abs(hydrophobic - charged) < 0.2) & (np.maximum(hydrophobic, charged) > 0.3))
+                }
+                for domain_type, (scores, eligible) in candidates.items():
+                    if eligible.any():
+                        i = int(np.argmax(np.where(eligible, scores, -np.inf)))
+                        best_domains[domain_type] = {
+                            "score": float(scores[i]),
                             "start": i + 1,
                             "end": i + window_size
                         }
@@ -245,13 +356,12 @@ class ProteinAnalyzer:
         
         return domains
 
-    async def analyze_protein(self, sequence: str) -> Dict:
+    def analyze_protein(self, sequence: str) -> Dict:
         """Analyze protein sequence using various prediction methods."""
         # Calculate amino acid composition
         total_len = len(sequence)
-        hydrophobic_content = sum(aa in self.hydrophobic for aa in sequence) / total_len
-        charged_content = sum(aa in self.charged for aa in sequence) / total_len
-        polar_content = sum(aa in self.polar for aa in sequence) / total_len
+        property_counts = self._property_counts(sequence).tolist()
+        hydrophobic_content, polar_content, charged_content = [count / total_len for count in property_counts[:3]]
         
         # Predict protein function based on composition
         function_scores = {}
@@ -284,13 +394,11 @@ class ProteinAnalyzer:
             )
             function_scores[max_content[1]] = max_content[0] * 100
         
-        # Predict domains (non-async now)
-        domains = self.predict_domains(sequence)  # Removed await since predict_domains is no longer async
+        # Predict domains
+        domains = self.predict_domains(sequence)
         
         # Predict secondary structure
-        helix_count = sum(aa in self.helix_prone for aa in sequence)
-        sheet_count = sum(aa in self.sheet_prone for aa in sequence)
-        coil_count = sum(aa in self.coil_prone for aa in sequence)
+        helix_count, sheet_count, coil_count = property_counts[3:]
         other_count = total_len - (helix_count + sheet_count + coil_count)
         
         # Distribute remaining residues proportionally
@@ -329,20 +437,22 @@ class ProteinAnalyzer:
         Predict protein secondary structure using PSIPRED API.
         Returns detailed secondary structure predictions with confidence scores.
         """
-        headers = {'Content-Type': 'application/json'}
+        cache_key = self._cache_key('psipred', sequence)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+        
         data = {
             'input_data': sequence,
             'submission_type': 'sequence'
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(f"{self.psipred_url}/submit", 
-                                     json=data, 
-                                     headers=headers) as response:
+            async with self._client_session() as session:
+                async with session.post(f"{self.psipred_url}/submit", json=data) as response:
                     if response.status == 200:
                         result = await response.json()
-                        return self._process_psipred_results(result)
+                        return self._cache_result(cache_key, self._process_psipred_results(result))
                     else:
                         # Fallback prediction
                         return await self._predict_secondary_structure_fallback(sequence)
@@ -355,43 +465,29 @@ class ProteinAnalyzer:
         Predict protein secondary structure using propensity scales.
         """
         try:
-            # Initialize structure predictions
-            structure = []
-            confidence = []
-            
             # Analyze each position
             window_size = 7
             pad = window_size // 2
-            padded_seq = 'X' * pad + sequence + 'X' * pad
+            codes = np.frombuffer(sequence.encode('ascii', 'replace'), dtype=np.uint8)
             
-            for i in range(pad, len(padded_seq) - pad):
-                window = padded_seq[i-pad:i+pad+1]
-                
-                # Calculate propensities
-                helix_score = sum(aa in self.helix_prone for aa in window) / window_size
-                sheet_score = sum(aa in self.sheet_prone for aa in window) / window_size
-                coil_score = sum(aa in self.coil_prone for aa in window) / window_size
-                
-                # Determine structure
-                scores = {
-                    'H': helix_score,
-                    'E': sheet_score,
-                    'C': coil_score
-                }
-                pred_structure = max(scores, key=scores.get)
-                max_score = max(scores.values())
-                
-                structure.append(pred_structure)
-                confidence.append(max_score * 100)
+            # Helix/sheet/coil membership per residue ('?' for non-ASCII matches none);
+            # the zero padding at both ends stands in for residues outside the sequence
+            propensity = np.pad(self._property_masks[codes, 3:], ((pad, pad), (0, 0)))
+            
+            # Calculate propensities for every centred window at once: (N, 3)
+            scores = sliding_window_view(propensity, window_size, axis=0).sum(axis=-1) / window_size
+            
+            # Determine structure (argmax keeps the H > E > C tie order)
+            best = np.argmax(scores, axis=1)
+            structure = np.frombuffer(b'HEC', dtype=np.uint8)[best].tobytes().decode('ascii')
+            confidence = (scores.max(axis=1) * 100).tolist()
             
             # Calculate percentages
             total_len = len(structure)
-            helix_count = structure.count('H')
-            sheet_count = structure.count('E')
-            coil_count = structure.count('C')
+            helix_count, sheet_count, coil_count = np.bincount(best, minlength=3).tolist()
             
             return {
-                'secondary_structure': ''.join(structure),
+                'secondary_structure': structure,
                 'confidence': confidence,
                 'helix_percentage': (helix_count / total_len) * 100,
                 'sheet_percentage': (sheet_count / total_len) * 100,
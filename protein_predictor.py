@@ -1,18 +1,77 @@
 from transformers import EsmModel, EsmTokenizer
+from functools import lru_cache
+import hashlib
+import os
+import tempfile
+import threading
 import torch
 import numpy as np
 
-# Load the ESM-2 model
+# ESM-2 model, loaded on first use so importing this module stays cheap
 model_name = "facebook/esm2_t6_8M_UR50D"
-tokenizer = EsmTokenizer.from_pretrained(model_name)
-model = EsmModel.from_pretrained(model_name)
+_tokenizer = None
+_model = None
+_model_lock = threading.Lock()
 
+def load_model():
+    """Return the ESM-2 tokenizer and model, loading them once on first call."""
+    global _tokenizer, _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _tokenizer = EsmTokenizer.from_pretrained(model_name)
+                _model = EsmModel.from_pretrained(model_name)
+    return _tokenizer, _model
+
+# Optional on-disk embedding cache, shared across processes and restarts
+embedding_cache_dir = os.environ.get("PROTEIN_EMBEDDING_CACHE_DIR")
+
+@lru_cache(maxsize=1024)
 def get_protein_embedding(sequence):
-    """Convert a protein sequence into an AI-generated numerical representation."""
+    """
+    Convert a protein sequence into an AI-generated numerical representation.
+    Results are memoized (and persisted when PROTEIN_EMBEDDING_CACHE_DIR is set),
+    so treat the returned tensor as read-only.
+    """
+    cache_path = None
+    if embedding_cache_dir:
+        # Keyed on the model too, so swapping models invalidates old entries
+        key = hashlib.sha1(f"{model_name}:{sequence}".encode('utf-8')).hexdigest()
+        cache_path = os.path.join(embedding_cache_dir, f"{key}.pt")
+        if os.path.exists(cache_path):
+            return torch.load(cache_path, weights_only=True)
+    
+    tokenizer, model = load_model()
     inputs = tokenizer(sequence, return_tensors="pt", add_special_tokens=True)
-    with torch.no_grad():
+    with torch.inference_mode():
         outputs = model(**inputs)
-    return outputs.last_hidden_state.mean(dim=1)  # Returns the AI-based feature embedding
+    embedding = outputs.last_hidden_state.mean(dim=1)  # Returns the AI-based feature embedding
+    
+    if cache_path:
+        os.makedirs(embedding_cache_dir, exist_ok=True)
+        # A unique temp file per writer, so concurrent misses on one sequence never share it
+        fd, tmp_path = tempfile.mkstemp(dir=embedding_cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                torch.save(embedding, f)
+            os.replace(tmp_path, cache_path)  # Atomic, so readers never see a partial file
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    return embedding
+
+def get_protein_embeddings_batch(sequences):
+    """
+    Embed several protein sequences with one padded forward pass.
+    Returns a (len(sequences), hidden_size) tensor. Padding is masked out of the
+    mean, so each row matches get_protein_embedding for that sequence.
+    """
+    tokenizer, model = load_model()
+    inputs = tokenizer(list(sequences), return_tensors="pt", padding=True, add_special_tokens=True)
+    with torch.inference_mode():
+        hidden = model(**inputs).last_hidden_state
+    mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+    return (hidden * mask).sum(dim=1) / mask.sum(dim=1)
 
 # Define a hydrophobicity scale for each amino acid
 hydrophobicity_dict = {
@@ -21,8 +80,23 @@ hydrophobicity_dict = {
     'T': -0.7, 'V': 4.2, 'W': -0.9, 'Y': -1.3
 }
 
+# Same scale as a 256-entry lookup table indexed by ASCII code (0 for unknown residues)
+hydrophobicity_lut = np.zeros(256, dtype=np.float64)
+for aa, value in hydrophobicity_dict.items():
+    hydrophobicity_lut[ord(aa)] = value
+
 def compute_hydrophobicity(sequence):
     """Compute the average hydrophobicity of a protein sequence."""
-    scores = [hydrophobicity_dict.get(aa, 0) for aa in sequence]  # Default 0 if unknown amino acid
-    return np.mean(scores) if scores else 0
+    # Non-ASCII characters encode as '?', which scores 0 like any unknown residue
+    codes = np.frombuffer(sequence.encode('ascii', 'replace'), dtype=np.uint8)
+    return float(hydrophobicity_lut[codes].mean()) if codes.size else 0.0
 
+def compute_hydrophobicity_change(original, mutated):
+    """Change in average hydrophobicity from a sequence to an equal-length mutant, rescoring only the differing positions."""
+    original_codes = np.frombuffer(original.encode('ascii', 'replace'), dtype=np.uint8)
+    mutated_codes = np.frombuffer(mutated.encode('ascii', 'replace'), dtype=np.uint8)
+    changed = np.flatnonzero(original_codes != mutated_codes)
+    if not changed.size:
+        return 0.0
+    delta = hydrophobicity_lut[mutated_codes[changed]] - hydrophobicity_lut[original_codes[changed]]
+    return float(delta.sum()) / original_codes.size
@@ -1,9 +1,7 @@
 import streamlit as st
-import matplotlib.pyplot as plt
 import numpy as np
-from protein_predictor import get_protein_embedding, compute_hydrophobicity
+from protein_predictor import get_protein_embedding, compute_hydrophobicity, compute_hydrophobicity_change
 from protein_analysis import ProteinAnalyzer, prepare_visualization_data
-import asyncio
 import plotly.graph_objects as go
 import plotly.express as px
 
@@ -30,6 +28,51 @@ Insulin:         FVNQHLCGSHLVEAL
 ```
 """)
 
+# Deletes every valid residue, so whatever survives translate() is invalid
+STRIP_VALID_AMINO_ACIDS = str.maketrans('', '', "ACDEFGHIKLMNPQRSTVWY")
+
+# Colors for the secondary structure pie charts
+STRUCTURE_COLORS = {
+    'Helix': '#FF9F1C',  # Orange
+    'Sheet': '#2EC4B6',  # Teal
+    'Coil': '#CCCCCC'    # Gray
+}
+
+@st.cache_resource
+def hydrophobicity_bar_template():
+    """Gradient bar shared by the hydrophobicity charts; copy it before adding markers."""
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        z=[np.linspace(0, 100, 100)],
+        colorscale=[
+            [0, 'blue'],    # Hydrophilic
+            [0.5, 'white'], # Neutral
+            [1, 'red']      # Hydrophobic
+        ],
+        showscale=False
+    ))
+    fig.update_layout(
+        height=100,
+        margin=dict(l=50, r=50, t=0, b=0),
+        yaxis=dict(showticklabels=False),
+        xaxis=dict(
+            ticktext=['Hydrophilic', 'Neutral', 'Hydrophobic'],
+            tickvals=[25, 50, 75],
+            tickmode='array'
+        )
+    )
+    return fig
+
+@st.cache_data(max_entries=256)
+def cached_hydrophobicity(sequence):
+    """Hydrophobicity score, memoized per sequence across reruns."""
+    return compute_hydrophobicity(sequence)
+
+@st.cache_data(max_entries=256)
+def analyze_sequence(_analyzer, sequence):
+    """Full protein analysis, memoized per sequence across reruns."""
+    return _analyzer.analyze_protein(sequence)
+
 # Initialize protein analyzer
 if 'protein_analyzer' not in st.session_state:
     st.session_state.protein_analyzer = ProteinAnalyzer()
@@ -52,18 +95,17 @@ if st.button("Predict"):
     if not sequence:
         st.error("⚠️ Please enter a protein sequence")
     else:
-        valid_amino_acids = set("ACDEFGHIKLMNPQRSTVWY")
-        invalid_chars = [char for char in sequence if char not in valid_amino_acids]
+        invalid_chars = sequence.translate(STRIP_VALID_AMINO_ACIDS)
         
         if invalid_chars:
-            st.error(f"⚠️ Invalid characters detected: {', '.join(set(invalid_chars))}")
+            st.error(f"⚠️ Invalid characters detected: {', '.join(sorted(set(invalid_chars)))}")
         else:
             with st.spinner("Analyzing protein sequence... This may take a few moments."):
                 # Get hydrophobicity score
-                hydrophobicity = compute_hydrophobicity(sequence)
+                hydrophobicity = cached_hydrophobicity(sequence)
                 
                 # Run real protein analysis
-                analysis_results = asyncio.run(st.session_state.protein_analyzer.analyze_protein(sequence))
+                analysis_results = analyze_sequence(st.session_state.protein_analyzer, sequence)
                 st.session_state.analysis_results = analysis_results
                 
                 # Prepare data for visualization
@@ -71,6 +113,8 @@ if st.button("Predict"):
                 
                 # Store original analysis in session state for mutation comparison
                 st.session_state.original_viz_data = viz_data
+                st.session_state.original_sequence = sequence
+                st.session_state.original_hydrophobicity = hydrophobicity
                 
                 # Display results
                 st.subheader("Results:")
@@ -84,20 +128,8 @@ if st.button("Predict"):
                 st.write("- 50: Neutral")
                 st.write("- 51-100: Hydrophobic (water-fearing)")
                 
-                # Create gradient from 0 to 100
-                gradient = np.linspace(0, 100, 100)
-                fig = go.Figure()
-                
-                # Add gradient bar
-                fig.add_trace(go.Heatmap(
-                    z=[gradient],
-                    colorscale=[
-                        [0, 'blue'],    # Hydrophilic
-                        [0.5, 'white'], # Neutral
-                        [1, 'red']      # Hydrophobic
-                    ],
-                    showscale=False
-                ))
+                # Start from the cached gradient bar
+                fig = go.Figure(hydrophobicity_bar_template())
                 
                 # Add marker for the current sequence
                 fig.add_trace(go.Scatter(
@@ -107,26 +139,13 @@ if st.button("Predict"):
                     marker=dict(size=15, color='black'),
                     showlegend=False
                 ))
-                
-                # Update layout
-                fig.update_layout(
-                    height=100,
-                    margin=dict(l=50, r=50, t=0, b=0),
-                    yaxis=dict(showticklabels=False),
-                    xaxis=dict(
-                        ticktext=['Hydrophilic', 'Neutral', 'Hydrophobic'],
-                        tickvals=[25, 50, 75],
-                        tickmode='array'
-                    )
-                )
                 st.plotly_chart(fig)
 
                 # 2. Protein Function Prediction
                 st.write("### 🧪 Predicted Functions")
                 if viz_data['function_scores']:
                     # Create bar chart
-                    functions = list(viz_data['function_scores'].keys())
-                    scores = list(viz_data['function_scores'].values())
+                    functions, scores = map(list, zip(*viz_data['function_scores'].items()))
                     
                     fig = go.Figure()
                     fig.add_trace(go.Bar(
@@ -168,15 +187,12 @@ if st.button("Predict"):
                 ss_percentages = viz_data['secondary_structure_percentages']
                 if ss_percentages:
                     # Create pie chart
+                    structures, percentages = map(list, zip(*ss_percentages.items()))
                     fig = px.pie(
-                        values=list(ss_percentages.values()),
-                        names=list(ss_percentages.keys()),
+                        values=percentages,
+                        names=structures,
                         title='Predicted Secondary Structure',
-                        color_discrete_map={
-                            'Helix': '#FF9F1C',  # Orange
-                            'Sheet': '#2EC4B6',  # Teal
-                            'Coil': '#CCCCCC'    # Gray
-                        }
+                        color_discrete_map=STRUCTURE_COLORS
                     )
                     fig.update_layout(height=400)
                     st.plotly_chart(fig)
@@ -207,25 +223,29 @@ if st.session_state.has_prediction:
     
     if st.button("Compare Mutation"):
         mutated_sequence = st.session_state.mutated_sequence
+        invalid_chars = mutated_sequence.translate(STRIP_VALID_AMINO_ACIDS)
         if not mutated_sequence:
             st.warning("⚠️ Please enter a mutated sequence to compare")
-        elif len(mutated_sequence) != len(st.session_state.sequence):
+        elif len(mutated_sequence) != len(st.session_state.original_sequence):
             st.warning("⚠️ The mutated sequence must be the same length as the original")
+        elif invalid_chars:
+            st.error(f"⚠️ Invalid characters detected: {', '.join(sorted(set(invalid_chars)))}")
         else:
             with st.spinner("Analyzing mutation effects..."):
                 # Get original data from session state
                 orig_viz_data = st.session_state.original_viz_data
                 
                 # Run analysis on mutated sequence
-                mutated_results = asyncio.run(st.session_state.protein_analyzer.analyze_protein(mutated_sequence))
+                mutated_results = analyze_sequence(st.session_state.protein_analyzer, mutated_sequence)
                 mutated_viz_data = prepare_visualization_data(mutated_results)
                 
                 # Show comparisons
                 st.subheader("🔄 Mutation Effects")
                 
-                # Compare hydrophobicity
-                orig_hydro = compute_hydrophobicity(st.session_state.sequence)
-                mut_hydro = compute_hydrophobicity(mutated_sequence)
+                # Compare hydrophobicity (original was computed on Predict)
+                # and only the mutated positions are rescored for the mutant
+                orig_hydro = st.session_state.original_hydrophobicity
+                mut_hydro = orig_hydro + compute_hydrophobicity_change(st.session_state.original_sequence, mutated_sequence)
                 
                 st.write("### 🌊 Hydrophobicity Change")
                 orig_hydro_percent = min(max((orig_hydro + 1) * 50, 0), 100)  # Clamp between 0 and 100
@@ -236,20 +256,8 @@ if st.session_state.has_prediction:
                 st.write(f"Mutated: {mut_hydro_percent:.1f}/100")
                 st.write(f"Change: {hydro_change:+.1f}")
                 
-                # Create comparison gradient
-                fig = go.Figure()
-                gradient = np.linspace(0, 100, 100)
-                
-                # Add gradient bar
-                fig.add_trace(go.Heatmap(
-                    z=[gradient],
-                    colorscale=[
-                        [0, 'blue'],    # Hydrophilic
-                        [0.5, 'white'], # Neutral
-                        [1, 'red']      # Hydrophobic
-                    ],
-                    showscale=False
-                ))
+                # Create comparison gradient from the cached gradient bar
+                fig = go.Figure(hydrophobicity_bar_template())
                 
                 # Add markers for both sequences
                 fig.add_trace(go.Scatter(
@@ -269,14 +277,6 @@ if st.session_state.has_prediction:
                 ))
                 
                 fig.update_layout(
-                    height=100,
-                    margin=dict(l=50, r=50, t=0, b=0),
-                    yaxis=dict(showticklabels=False),
-                    xaxis=dict(
-                        ticktext=['Hydrophilic', 'Neutral', 'Hydrophobic'],
-                        tickvals=[25, 50, 75],
-                        tickmode='array'
-                    ),
                     showlegend=True,
                     legend=dict(
                         orientation="h",
@@ -298,7 +298,7 @@ if st.session_state.has_prediction:
                 
                 if orig_funcs or mut_funcs:  # Show if either has predictions
                     # Create comparison bar chart
-                    functions = list(set(orig_funcs.keys()) | set(mut_funcs.keys()))
+                    functions = list(orig_funcs.keys() | mut_funcs.keys())
                     orig_scores = [orig_funcs.get(f, 0) for f in functions]
                     mut_scores = [mut_funcs.get(f, 0) for f in functions]
                     
@@ -373,29 +373,23 @@ if st.session_state.has_prediction:
                     col1, col2 = st.columns(2)
                     
                     with col1:
+                        structures, percentages = map(list, zip(*orig_ss.items()))
                         fig1 = px.pie(
-                            values=list(orig_ss.values()),
-                            names=list(orig_ss.keys()),
+                            values=percentages,
+                            names=structures,
                             title='Original Structure',
-                            color_discrete_map={
-                                'Helix': '#FF9F1C',
-                                'Sheet': '#2EC4B6',
-                                'Coil': '#CCCCCC'
-                            }
+                            color_discrete_map=STRUCTURE_COLORS
                         )
                         fig1.update_layout(height=300)
                         st.plotly_chart(fig1)
                     
                     with col2:
+                        structures, percentages = map(list, zip(*mut_ss.items()))
                         fig2 = px.pie(
-                            values=list(mut_ss.values()),
-                            names=list(mut_ss.keys()),
+                            values=percentages,
+                            names=structures,
                             title='Mutated Structure',
-                            color_discrete_map={
-                                'Helix': '#FF9F1C',
-                                'Sheet': '#2EC4B6',
-                                'Coil': '#CCCCCC'
-                            }
+                            color_discrete_map=STRUCTURE_COLORS
                         )
                         fig2.update_layout(height=300)
                         st.plotly_chart(fig2)